@@ -1,14 +1,23 @@
 import os
 import time
 import uuid
+import hashlib
 import logging
-from typing import Any, Dict, Optional, Union, List
+import threading
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Optional, Tuple
+
+import anyio
+import orjson
 
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, field_validator
 
-from renderer import render_article  # ✅ 就從 render.py 匯入
+from renderer import iter_render_article, render_article  # ✅ 就從 render.py 匯入
 
 
 logger = logging.getLogger("article_render.app")
@@ -25,39 +34,73 @@ def _rid() -> str:
     return uuid.uuid4().hex[:10]
 
 
-# ===== Pydantic Request/Response =====
-class Title(BaseModel):
-    line1: str = ""
-    line2: str = ""
+# ===== Render cache (LRU, successful renders only) =====
+_CACHE_MAX = int(os.getenv("RENDER_CACHE_SIZE", "512"))
+_CACHE: "OrderedDict[str, Tuple[str, Dict[str, Any]]]" = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+
 
+def _cache_key(article: Dict[str, Any], images: Dict[str, Any]) -> str:
+    payload = orjson.dumps([article, images], option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
 
-class Block(BaseModel):
-    type: str
-    text: Optional[str] = None
-    variant: Optional[str] = None
 
-    primary: Optional[str] = None
-    secondary: Optional[str] = None
+def _cache_get(key: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+    with _CACHE_LOCK:
+        hit = _CACHE.get(key)
+        if hit is not None:
+            _CACHE.move_to_end(key)
+        return hit
 
-    id: Optional[Union[int, str]] = None
-    purpose: Optional[str] = None
-    ratio: Optional[str] = None
 
-    title: Optional[str] = None
-    items: Optional[List[Dict[str, Any]]] = None
+def _cache_put(key: str, value: Tuple[str, Dict[str, Any]]) -> None:
+    if _CACHE_MAX <= 0:
+        return
+    with _CACHE_LOCK:
+        _CACHE[key] = value
+        _CACHE.move_to_end(key)
+        while len(_CACHE) > _CACHE_MAX:
+            _CACHE.popitem(last=False)
 
-    leading_break: Optional[bool] = False
 
+def _render_cached(
+    article: Dict[str, Any], images: Dict[str, Any], request_id: str
+) -> Tuple[str, Dict[str, Any], bool]:
+    """render_article() behind the LRU; returns (html, report, cache_hit). Runs in the threadpool."""
+    t0 = time.perf_counter()
+    try:
+        key: Optional[str] = _cache_key(article, images)
+    except TypeError:
+        key = None
 
-class Article(BaseModel):
-    title: Title = Field(default_factory=Title)
-    content: List[Block] = Field(default_factory=list)
+    cached = _cache_get(key) if key else None
+    if cached is not None:
+        html, report = cached
+        # the stored report is shared; report this request's own timing
+        return html, dict(report, render_ms=int((time.perf_counter() - t0) * 1000)), True
 
+    html, report = render_article(article, images, request_id=request_id)
+    if key and report.get("ok"):
+        _cache_put(key, (html, report))
+    return html, report, False
 
+
+# ===== Pydantic Request/Response =====
 class RenderRequest(BaseModel):
-    article: Article
+    # Kept as a plain dict: render_article() validates block shapes itself,
+    # so a typed model would only add a second validation + model_dump() pass.
+    article: Dict[str, Any]
     images: Dict[str, Dict[str, Any]] = Field(default_factory=dict)
 
+    @field_validator("article")
+    @classmethod
+    def content_must_be_list(cls, v: Dict[str, Any]) -> Dict[str, Any]:
+        # The renderer iterates content directly; reject anything else with
+        # a 422 up front, as the old List[Block] field did.
+        if not isinstance(v.get("content", []), list):
+            raise ValueError("article.content must be a list")
+        return v
+
 
 class RenderResponse(BaseModel):
     html: str
@@ -65,7 +108,15 @@ class RenderResponse(BaseModel):
     request_id: str
 
 
-app = FastAPI(title="Article JSON -> HTML Renderer", version="1.1.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Size the shared worker-thread pool used by run_in_threadpool().
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    limiter.total_tokens = int(os.getenv("RENDER_THREADS", "8"))
+    yield
+
+
+app = FastAPI(title="Article JSON -> HTML Renderer", version="1.1.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -82,14 +133,22 @@ def root():
 
 
 @app.post("/render", response_model=RenderResponse)
-def render_endpoint(req: RenderRequest):
+async def render_endpoint(req: RenderRequest):
     request_id = _rid()
     t0 = time.time()
 
-    article_dict = req.article.model_dump()
+    article_dict = req.article
     images_dict = req.images or {}
 
-    html, report = render_article(article_dict, images_dict, request_id=request_id)
+    # CPU-bound (hashing + rendering): keep it off the event loop.
+    html, report, cache_hit = await run_in_threadpool(_render_cached, article_dict, images_dict, request_id)
+    if cache_hit:
+        logger.info(
+            f"[RID={request_id}] /render cache_hit "
+            f"html_len={len(html)} "
+            f"ms={int((time.time()-t0)*1000)}"
+        )
+        return RenderResponse(html=html, report=report, request_id=request_id)
 
     logger.info(
         f"[RID={request_id}] /render "
@@ -105,7 +164,19 @@ def render_endpoint(req: RenderRequest):
     return RenderResponse(html=html, report=report, request_id=request_id)
 
 
+@app.post("/render/html", response_class=StreamingResponse)
+def render_html_endpoint(req: RenderRequest):
+    # Raw HTML streamed block by block; no JSON envelope / report (see /render).
+    request_id = _rid()
+    logger.info(f"[RID={request_id}] /render/html stream start")
+    # Sync generator: Starlette iterates it in the threadpool.
+    chunks = iter_render_article(req.article, req.images or {}, request_id=request_id)
+    return StreamingResponse(chunks, media_type="text/html; charset=utf-8", headers={"X-Request-ID": request_id})
+
+
 if __name__ == "__main__":
     import uvicorn
     port = int(os.getenv("PORT", "10000"))
-    uvicorn.run("app:app", host="0.0.0.0", port=port, reload=False)
+    # Local dev only; production runs under gunicorn (see gunicorn.conf.py).
+    # uvicorn's default loop/http already use uvloop/httptools when installed.
+    uvicorn.run("app:app", host="0.0.0.0", port=port)
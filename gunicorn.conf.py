@@ -0,0 +1,34 @@
+# gunicorn.conf.py
+# ============================================================
+# Production entrypoint (picked up automatically by gunicorn):
+#   gunicorn app:app
+# Equivalent CLI:
+#   gunicorn app:app -k uvicorn_worker.UvicornWorker --workers $(nproc) \
+#       --timeout 30 --keep-alive 30 --bind 0.0.0.0:$PORT
+# Plain-uvicorn production equivalent (no gunicorn):
+#   uvicorn app:app --host 0.0.0.0 --port $PORT --workers N \
+#       --loop uvloop --http httptools --limit-concurrency 1000
+# --limit-concurrency has no gunicorn setting; under UvicornWorker it stays
+# unlimited. uvloop/httptools are picked automatically when installed.
+# `python app.py` (uvicorn.run) is kept for local dev only.
+# ============================================================
+
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '10000')}"
+worker_class = "uvicorn_worker.UvicornWorker"
+
+
+def _default_workers() -> int:
+    # CPUs this process may run on, not the whole host (cpu_count()); each
+    # worker holds its own render caches. CPU quotas are not visible here,
+    # so set WEB_CONCURRENCY explicitly in quota-limited containers.
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # not available on macOS / Windows
+        return 2
+
+
+workers = int(os.getenv("WEB_CONCURRENCY", str(_default_workers())))
+timeout = 30
+keepalive = 30
@@ -8,12 +8,14 @@
 from __future__ import annotations
 
 import html
-import json
 import logging
 import re
+import threading
 import time
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Tuple, Union
+from functools import lru_cache
+from typing import Any, Callable, Container, Dict, Iterator, List, Optional, Tuple, Union
 
 logger = logging.getLogger("article_renderer")
 
@@ -28,22 +30,17 @@ if not logger.handlers:
     logger.addHandler(_h)
 logger.setLevel(logging.INFO)
 
+# **bold** (does not span lines: "." excludes "\n")
+_BOLD_RE = re.compile(r"\*\*(.+?)\*\*")
+# One pass for: literal "\n" -> LF, CRLF/CR -> LF. A CR directly before a
+# literal "\n" collapses with it, matching the old replace() order.
+_NL_RE = re.compile(r"\r(?:\\n|\n)?|\\n")
+
 
 # ----------------------------
 # Helpers
 # ----------------------------
 
-def _safe_json(obj: Any, limit: int = 2000) -> str:
-    """Safe stringify for logs (avoid huge blobs)."""
-    try:
-        s = json.dumps(obj, ensure_ascii=False)
-    except Exception:
-        s = repr(obj)
-    if len(s) > limit:
-        return s[:limit] + f"...(truncated,len={len(s)})"
-    return s
-
-
 def _is_str(x: Any) -> bool:
     return isinstance(x, str)
 
@@ -57,10 +54,18 @@ def _normalize_text(s: str) -> str:
     """
     if not isinstance(s, str):
         return ""
-    # literal "\n" -> newline
-    s = s.replace("\\n", "\n")
-    s = s.replace("\r\n", "\n").replace("\r", "\n")
-    return s
+    # membership checks skip the regex entirely for clean input
+    if "\\n" not in s and "\r" not in s:
+        return s
+    return _NL_RE.sub("\n", s)
+
+
+def _get_text(d: Dict[str, Any], key: str) -> str:
+    """Fetch d[key] as normalized text ("" when missing/falsy)."""
+    v = d.get(key)
+    if not v:
+        return ""
+    return _normalize_text(v if isinstance(v, str) else str(v))
 
 
 def _escape(s: str) -> str:
@@ -68,26 +73,50 @@ def _escape(s: str) -> str:
     return html.escape(s, quote=True)
 
 
-def _inline_md_to_html(text: str) -> str:
+def _escape_raw(s: str) -> str:
     """
-    Minimal inline markdown:
-    - **bold** -> <strong>
-    - Keep existing Chinese quotes etc.
-    - Newlines are handled later globally; here we keep '\n' as-is.
+    HTML escape for fields that bypass _normalize_text (urls, ids, type names,
+    error text), also turning literal "\\n" into a newline so rendered output
+    never contains one.
     """
-    text = _normalize_text(text)
-    esc = _escape(text)
+    if "\\n" in s:
+        s = s.replace("\\n", "\n")
+    return _escape(s)
 
-    # bold: **...**
-    esc = re.sub(r"\*\*(.+?)\*\*", r"<strong>\1</strong>", esc)
 
-    return esc
+def _text_with_breaks(t: str) -> str:
+    """
+    Convert already-normalized text (see _get_text) to HTML with minimal
+    inline markdown:
+    - **bold** -> <strong>
+    - newline -> <br>
+    - Keep existing Chinese quotes etc.
+    """
+    t = _escape(t)
+    # membership checks skip the regex / replace for plain text
+    if "**" in t:
+        t = _BOLD_RE.sub(r"<strong>\1</strong>", t)
+    if "\n" in t:
+        t = t.replace("\n", "<br>")
+    return t
 
 
-def _text_with_breaks(text: str) -> str:
-    """Convert text to HTML with <br> for newlines."""
-    t = _inline_md_to_html(text)
-    return t.replace("\n", "<br>")
+def _canonical_images(images: Dict[Any, Any]) -> Dict[Any, Any]:
+    """
+    Add str() aliases for non-str image keys (Python callers passing {1: ...})
+    so image_slot lookups by str(id) hit on the first try. JSON input already
+    has str keys and is returned as-is. An existing truthy str key wins, same
+    precedence as images.get(str(id)) or images.get(id).
+    """
+    if all(isinstance(k, str) for k in images):
+        return images
+    out = dict(images)
+    for k, v in images.items():
+        if not isinstance(k, str):
+            sk = str(k)
+            if not out.get(sk):
+                out[sk] = v
+    return out
 
 
 def _style_article_container() -> str:
@@ -124,26 +153,167 @@ class ValidationReport:
         self.warnings.append(msg)
 
 
+# Per-type block checks: (blk, index, report, images) -> None
+
+def _v_text(blk: Dict[str, Any], i: int, rpt: ValidationReport, images: Optional[Dict[str, Any]]) -> None:
+    if not _is_str(blk.get("text", "")):
+        rpt.add_error(f"content[{i}].text must be a string for type={blk.get('type')}")
+
+
+def _v_noop(blk: Dict[str, Any], i: int, rpt: ValidationReport, images: Optional[Dict[str, Any]]) -> None:
+    return None
+
+
+def _v_blockquote(blk: Dict[str, Any], i: int, rpt: ValidationReport, images: Optional[Dict[str, Any]]) -> None:
+    if not _is_str(blk.get("primary", "")):
+        rpt.add_error(f"content[{i}].primary must be a string for blockquote")
+    # secondary optional but if present must be str
+    sec = blk.get("secondary")
+    if sec is not None and not _is_str(sec):
+        rpt.add_error(f"content[{i}].secondary must be a string if provided")
+
+
+def _v_image_slot(blk: Dict[str, Any], i: int, rpt: ValidationReport, images: Optional[Dict[str, Any]]) -> None:
+    slot_id = blk.get("id")
+    if not isinstance(slot_id, int):
+        rpt.add_error(f"content[{i}].id must be an int for image_slot")
+    else:
+        # images keys are strings in JSON by default
+        if images is None or (str(slot_id) not in images and slot_id not in images):
+            rpt.missing_image_slots.append(slot_id)
+
+
+def _v_info_card(blk: Dict[str, Any], i: int, rpt: ValidationReport, images: Optional[Dict[str, Any]]) -> None:
+    if not _is_str(blk.get("title", "")):
+        rpt.add_error(f"content[{i}].title must be a string for info_card")
+    if not _is_str(blk.get("text", "")):
+        rpt.add_error(f"content[{i}].text must be a string for info_card")
+
+
+def _v_truth_list(blk: Dict[str, Any], i: int, rpt: ValidationReport, images: Optional[Dict[str, Any]]) -> None:
+    items = blk.get("items")
+    if not isinstance(items, list) or len(items) == 0:
+        rpt.add_error(f"content[{i}].items must be a non-empty list for truth_list")
+
+
+def _v_icon_list(blk: Dict[str, Any], i: int, rpt: ValidationReport, images: Optional[Dict[str, Any]]) -> None:
+    items = blk.get("items")
+    if not isinstance(items, list) or len(items) == 0:
+        rpt.add_error(f"content[{i}].items must be a non-empty list for icon_list")
+
+
+def _v_highlight_box(blk: Dict[str, Any], i: int, rpt: ValidationReport, images: Optional[Dict[str, Any]]) -> None:
+    if not _is_str(blk.get("text", "")):
+        rpt.add_error(f"content[{i}].text must be a string for highlight_box")
+
+
+# ----------------------------
+# Per-signature codegen
+# ----------------------------
+# A content "signature" is the tuple of block types. Validator and renderer
+# both generate straight-line functions per signature and cache them here.
+
+_NOT_OBJECT = object()
+# Stands in for any type outside the known set, so request-supplied type
+# strings never become cache keys or generated source.
+_UNKNOWN_TYPE = object()
+
+# Codegen cost grows with the block count; long articles take the generic loop.
+_SPECIALIZE_MAX_BLOCKS = 64
+
+
+def _content_signature(content: Any, known: Container[str]) -> Optional[Tuple[Any, ...]]:
+    """
+    Block types (_NOT_OBJECT for non-object blocks, _UNKNOWN_TYPE for types
+    not in `known`), or None if not specializable.
+    """
+    if len(content) > _SPECIALIZE_MAX_BLOCKS:
+        return None
+    sig: List[Any] = []
+    for blk in content:
+        if not isinstance(blk, dict):
+            sig.append(_NOT_OBJECT)
+            continue
+        t = blk.get("type")
+        sig.append(t if isinstance(t, str) and t in known else _UNKNOWN_TYPE)
+    return tuple(sig)
+
+
+class _SignatureCache:
+    """
+    Bounded LRU of generated functions keyed by content signature.
+    A signature is compiled once it has been seen `compile_after` times:
+    compiling costs ~25us per block while the generated loop saves well
+    under 1us per block per call, so only recurring signatures pay off.
+    Sighting counts live in a separate bounded LRU so a stream of one-off
+    signatures cannot evict compiled entries.
+    """
+
+    def __init__(self, maxsize: int = 256, compile_after: int = 64):
+        self.maxsize = maxsize
+        self.compile_after = compile_after
+        self._data: "OrderedDict[Tuple[Any, ...], Callable[..., None]]" = OrderedDict()
+        self._seen: "OrderedDict[Tuple[Any, ...], int]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, sig: Tuple[Any, ...], build: Callable[[Tuple[Any, ...]], Callable[..., None]]) -> Optional[Callable[..., None]]:
+        with self._lock:
+            fn = self._data.get(sig)
+            if fn is not None:
+                self._data.move_to_end(sig)
+                return fn
+            seen = self._seen.get(sig, 0) + 1
+            if seen < self.compile_after:
+                self._seen[sig] = seen
+                self._seen.move_to_end(sig)
+                if len(self._seen) > self.maxsize:
+                    self._seen.popitem(last=False)
+                return None
+
+        # compile outside the lock so other threads are not blocked on exec()
+        fn = build(sig)
+        with self._lock:
+            # another thread may have stored its build meanwhile; keep that one
+            current = self._data.get(sig)
+            if current is not None:
+                return current
+            self._seen.pop(sig, None)
+            self._data[sig] = fn
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return fn
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._seen.clear()
+
+
+_BLOCK_VALIDATORS = _SignatureCache()
+
+
 class ArticleValidator:
     """
     Validate article.json structure, detect missing images, unknown types,
     and common string escaping issues.
     """
 
-    SUPPORTED_TYPES = {
-        "p",
-        "h1",
-        "h2",
-        "h3",
-        "hr",
-        "blockquote",
-        "image_slot",
-        "info_card",
-        "truth_list",
-        "icon_list",
-        "highlight_box",
+    _VALIDATORS: Dict[str, Callable[[Dict[str, Any], int, ValidationReport, Optional[Dict[str, Any]]], None]] = {
+        "p": _v_text,
+        "h1": _v_text,
+        "h2": _v_text,
+        "h3": _v_text,
+        "hr": _v_noop,
+        "blockquote": _v_blockquote,
+        "image_slot": _v_image_slot,
+        "info_card": _v_info_card,
+        "truth_list": _v_truth_list,
+        "icon_list": _v_icon_list,
+        "highlight_box": _v_highlight_box,
     }
 
+    SUPPORTED_TYPES = frozenset(_VALIDATORS)
+
     def validate(self, article: Dict[str, Any], images: Optional[Dict[str, Any]]) -> ValidationReport:
         rpt = ValidationReport()
 
@@ -180,60 +350,311 @@ class ArticleValidator:
         scan_text_fields(article)
 
         # validate blocks
+        sig = _content_signature(content, self.SUPPORTED_TYPES)
+        specialized = _BLOCK_VALIDATORS.get(sig, self._compile_block_validator) if sig is not None else None
+        if specialized is not None:
+            specialized(content, rpt, images)
+            return rpt
+
         for i, blk in enumerate(content):
             if not isinstance(blk, dict):
                 rpt.add_error(f"content[{i}] must be an object")
                 continue
 
             t = blk.get("type")
-            if t not in self.SUPPORTED_TYPES:
+            v = self._VALIDATORS.get(t) if isinstance(t, str) else None
+            if v is None:
                 rpt.unknown_block_types.append(str(t))
                 rpt.add_warn(f"Unknown block type at content[{i}]: {t}")
-
-            # required fields by type
-            if t in {"p", "h1", "h2", "h3"}:
-                if not _is_str(blk.get("text", "")):
-                    rpt.add_error(f"content[{i}].text must be a string for type={t}")
-
-            if t == "blockquote":
-                if not _is_str(blk.get("primary", "")):
-                    rpt.add_error(f"content[{i}].primary must be a string for blockquote")
-                # secondary optional but if present must be str
-                sec = blk.get("secondary")
-                if sec is not None and not _is_str(sec):
-                    rpt.add_error(f"content[{i}].secondary must be a string if provided")
-
-            if t == "image_slot":
-                slot_id = blk.get("id")
-                if not isinstance(slot_id, int):
-                    rpt.add_error(f"content[{i}].id must be an int for image_slot")
-                else:
-                    # images keys are strings in JSON by default
-                    if images is None or (str(slot_id) not in images and slot_id not in images):
-                        rpt.missing_image_slots.append(slot_id)
-
-            if t == "info_card":
-                if not _is_str(blk.get("title", "")):
-                    rpt.add_error(f"content[{i}].title must be a string for info_card")
-                if not _is_str(blk.get("text", "")):
-                    rpt.add_error(f"content[{i}].text must be a string for info_card")
-
-            if t == "truth_list":
-                items = blk.get("items")
-                if not isinstance(items, list) or len(items) == 0:
-                    rpt.add_error(f"content[{i}].items must be a non-empty list for truth_list")
-
-            if t == "icon_list":
-                items = blk.get("items")
-                if not isinstance(items, list) or len(items) == 0:
-                    rpt.add_error(f"content[{i}].items must be a non-empty list for icon_list")
-
-            if t == "highlight_box":
-                if not _is_str(blk.get("text", "")):
-                    rpt.add_error(f"content[{i}].text must be a string for highlight_box")
+                continue
+            v(blk, i, rpt, images)
 
         return rpt
 
+    def _compile_block_validator(self, sig: Tuple[Any, ...]) -> Callable[..., None]:
+        """Emit the per-block checks of validate() unrolled for one signature."""
+        ns: Dict[str, Any] = {v.__name__: v for v in self._VALIDATORS.values()}
+        lines = ["def _validate_blocks(content, rpt, images):"]
+        for i, t in enumerate(sig):
+            if t is _NOT_OBJECT:
+                lines.append(f"    rpt.add_error({f'content[{i}] must be an object'!r})")
+                continue
+            if t is _UNKNOWN_TYPE:
+                # read the type at run time; only the index is baked in
+                lines.append(f"    t = content[{i}].get('type')")
+                lines.append("    rpt.unknown_block_types.append(str(t))")
+                lines.append(f"    rpt.add_warn(f'Unknown block type at content[{i}]: {{t}}')")
+                continue
+            v = self._VALIDATORS[t]
+            if v is not _v_noop:
+                lines.append(f"    {v.__name__}(content[{i}], {i}, rpt, images)")
+        lines.append("    return None")
+        exec(compile("\n".join(lines), f"<block-validator len={len(sig)}>", "exec"), ns)
+        return ns["_validate_blocks"]
+
+
+# ----------------------------
+# Block handlers
+# ----------------------------
+
+# article chrome (container / title / hero_quote)
+_ARTICLE_OPEN = f'<div style="{_style_article_container()}">'
+_TITLE_H1_OPEN = '<h1 style="font-weight: 800; margin-bottom: 20px; font-size: 30px; line-height: 1.4; color: #111;">'
+_HERO_OPEN = (
+    '<div style="background-color: #333; color: #fff; padding: 25px; border-radius: 12px; text-align: center; margin: 30px 0;">'
+)
+_HERO_ZH_OPEN = '<h3 style="margin: 0 0 10px 0; color: #fff; font-size: 22px;">「'
+_HERO_ZH_CLOSE = "」</h3>"
+_HERO_EN_OPEN = '<p style="margin: 0; font-size: 0.95em; opacity: 0.9;">'
+
+_H1_OPEN = '<h1 style="font-weight: 800; color: #222; font-size: 24px; margin-bottom: 20px;">'
+_H1_CLOSE = "</h1>"
+_H2_OPEN = '<h2 style="font-weight: 800; color: #222; font-size: 24px; margin-bottom: 20px;">'
+_H2_CLOSE = "</h2>"
+_H3_OPEN = '<h3 style="font-weight: bold; color: #444; margin-top: 30px;">'
+_H3_CLOSE = "</h3>"
+_HR = '<hr style="margin: 50px 0; border: 0; border-top: 1px solid #eee;">'
+
+_BLOCKQUOTE_EMPHASIS_OPEN = (
+    '<blockquote style="border-left: 6px solid #d32f2f; background-color: #fff5f5; padding: 20px; margin: 30px 0; font-size: 1.1em; border-radius: 0 8px 8px 0;">'
+)
+_BLOCKQUOTE_EMPHASIS_SECONDARY_OPEN = (
+    '<br><span style="font-size: 0.9em; color: #666; margin-top: 10px; display: block;">—— '
+)
+_BLOCKQUOTE_OPEN = "<blockquote>"
+_BLOCKQUOTE_CLOSE = "</blockquote>"
+
+_INFO_CARD_GREEN_OPEN = (
+    '<div style="background-color: #f1f8e9; padding: 15px; border-radius: 8px; margin: 20px 0; font-size: 0.95em;">'
+)
+_INFO_CARD_DASHED_OPEN = '<div style="border: 2px dashed #ccc; padding: 18px; border-radius: 10px; margin: 20px 0;">'
+_INFO_CARD_DEFAULT_OPEN = '<div style="padding: 15px; border-radius: 8px; margin: 20px 0; border: 1px solid #eee;">'
+
+_TRUTH_LIST_OPEN = '<ul style="list-style-type: none; padding-left: 0; margin: 15px 0;">'
+_TRUTH_MYTH_OPEN = '<li style="margin-bottom: 10px; color: #d32f2f; font-weight: bold;">❌ '
+_TRUTH_FACT_OPEN = '<li style="margin-bottom: 10px; color: #2e7d32; font-weight: bold;">✅ '
+_TRUTH_OTHER_OPEN = '<li style="margin-bottom: 10px;">• '
+_TRUTH_OPEN_BY_KIND = {"myth": _TRUTH_MYTH_OPEN, "fact": _TRUTH_FACT_OPEN}
+
+_ICON_LIST_OPEN = '<ul style="list-style: none; padding: 0; margin: 10px 0;">'
+_ICON_ITEM_OPEN = '<li style="display: flex; align-items: flex-start; margin-bottom: 15px;">'
+_ICON_SPAN_OPEN = '<span style="font-size: 24px; margin-right: 15px; line-height: 1;">'
+_ICON_TEXT_OPEN = '<span style="color: #333;">'
+
+_HIGHLIGHT_DARK_OPEN = (
+    '<div style="background-color: #333; color: #fff; padding: 18px 20px; border-radius: 12px; text-align: center; margin: 30px 0; font-weight: 800; font-size: 20px;">'
+)
+_HIGHLIGHT_OUTLINE_OPEN = (
+    '<div style="border: 2px solid #333; padding: 18px 20px; border-radius: 12px; text-align: center; margin: 30px 0; font-weight: 800; font-size: 20px;">'
+)
+
+_IMG_TMPL = (
+    '<img src="%s" width="%d" height="%d" alt="%s" '
+    'style="width: 100%%; height: auto; border-radius: 10px; margin: 30px 0;">'
+)
+_CAPTION_OPEN = '<p style="color: #666; font-size: 0.9em; margin-top: -18px; margin-bottom: 18px;">'
+
+_P_OPEN = "<p>"
+_P_CLOSE = "</p>"
+_LI_CLOSE = "</li>"
+_DIV_CLOSE = "</div>"
+_UL_CLOSE = "</ul>"
+
+
+# Fragment builders: pure functions of already-normalized text, memoized so
+# re-rendering the same article (edits, previews, retries) skips the
+# escape/markdown/<br> work for unchanged blocks.
+_FRAGMENT_CACHE_SIZE = 2048
+
+
+@lru_cache(maxsize=_FRAGMENT_CACHE_SIZE)
+def _text_block_html(open_tag: str, txt: str, close_tag: str) -> str:
+    return open_tag + _text_with_breaks(txt) + close_tag
+
+
+@lru_cache(maxsize=_FRAGMENT_CACHE_SIZE)
+def _blockquote_html(emphasis: bool, primary: str, secondary: str) -> str:
+    if emphasis:
+        s = _BLOCKQUOTE_EMPHASIS_OPEN
+        if primary:
+            s += "\n<strong>「" + _escape(primary) + "」</strong>"
+        if secondary:
+            s += "\n" + _BLOCKQUOTE_EMPHASIS_SECONDARY_OPEN + _escape(secondary) + "</span>"
+    else:
+        # fallback
+        s = _BLOCKQUOTE_OPEN
+        if primary:
+            s += "\n<strong>" + _escape(primary) + "</strong>"
+        if secondary:
+            s += "\n<br><span>" + _escape(secondary) + "</span>"
+    return s + "\n" + _BLOCKQUOTE_CLOSE
+
+
+@lru_cache(maxsize=_FRAGMENT_CACHE_SIZE)
+def _info_card_html(open_tag: str, title: str, txt: str) -> str:
+    s = open_tag
+    if title:
+        s += "\n<strong>" + _escape(title) + "</strong><br>"
+    if txt:
+        s += "\n" + _text_with_breaks(txt)
+    return s + "\n" + _DIV_CLOSE
+
+
+@lru_cache(maxsize=_FRAGMENT_CACHE_SIZE)
+def _truth_item_html(kind: str, txt: str) -> str:
+    return _TRUTH_OPEN_BY_KIND.get(kind, _TRUTH_OTHER_OPEN) + _escape(txt) + _LI_CLOSE
+
+
+@lru_cache(maxsize=_FRAGMENT_CACHE_SIZE)
+def _icon_item_html(icon: str, title: str, txt: str) -> str:
+    s = _ICON_ITEM_OPEN + "\n" + _ICON_SPAN_OPEN + _escape(icon) + "</span>\n<div>"
+    if title:
+        s += "\n<strong>" + _escape(title) + "</strong><br>"
+    if txt:
+        s += "\n" + _ICON_TEXT_OPEN + _text_with_breaks(txt) + "</span>"
+    return s + "\n</div></li>"
+
+
+_FRAGMENT_CACHES = (_text_block_html, _blockquote_html, _info_card_html, _truth_item_html, _icon_item_html)
+
+
+def clear_render_cache() -> None:
+    """Drop all memoized block fragments (e.g. for long-running workers)."""
+    for fn in _FRAGMENT_CACHES:
+        fn.cache_clear()
+
+
+def _render_p(blk: Dict[str, Any], images: Optional[Dict[str, Any]]) -> str:
+    return _text_block_html(_P_OPEN, _get_text(blk, "text"), _P_CLOSE)
+
+
+def _render_h1(blk: Dict[str, Any], images: Optional[Dict[str, Any]]) -> str:
+    return _text_block_html(_H1_OPEN, _get_text(blk, "text"), _H1_CLOSE)
+
+
+def _render_h2(blk: Dict[str, Any], images: Optional[Dict[str, Any]]) -> str:
+    return _text_block_html(_H2_OPEN, _get_text(blk, "text"), _H2_CLOSE)
+
+
+def _render_h3(blk: Dict[str, Any], images: Optional[Dict[str, Any]]) -> str:
+    return _text_block_html(_H3_OPEN, _get_text(blk, "text"), _H3_CLOSE)
+
+
+def _render_hr(blk: Dict[str, Any], images: Optional[Dict[str, Any]]) -> str:
+    return _HR
+
+
+def _render_blockquote(blk: Dict[str, Any], images: Optional[Dict[str, Any]]) -> str:
+    variant = str(blk.get("variant", "emphasis") or "emphasis")
+    primary = _get_text(blk, "primary").strip()
+    secondary = _get_text(blk, "secondary").strip()
+    return _blockquote_html(variant == "emphasis", primary, secondary)
+
+
+def _render_image_slot(blk: Dict[str, Any], images: Optional[Dict[str, Any]]) -> str:
+    # NOTE: we do NOT render "圖片X-生成" heading here.
+    # We render the actual <img> if images are provided.
+    slot_id = blk.get("id")
+    key_str = str(slot_id)
+    meta = None
+    if images:
+        # keys are canonicalized to str by render_article; the second lookup
+        # only runs on a miss (e.g. float ids)
+        meta = images.get(key_str) or images.get(slot_id)
+
+    if not meta:
+        return f"<!-- IMAGE_SLOT_MISSING id={_escape_raw(key_str)} -->"
+
+    url = str(meta.get("url", "") or "")
+    alt = _get_text(meta, "alt")
+    width = int(meta.get("width", 1200) or 1200)
+    height = int(meta.get("height", 630) or 630)
+    caption = _get_text(meta, "caption").strip()
+
+    s = _IMG_TMPL % (_escape_raw(url), width, height, _escape(alt))
+    if caption:
+        s += "\n" + _CAPTION_OPEN + _text_with_breaks(caption) + _P_CLOSE
+    return s
+
+
+def _render_info_card(blk: Dict[str, Any], images: Optional[Dict[str, Any]]) -> str:
+    variant = str(blk.get("variant", "green") or "green")
+    title = _get_text(blk, "title").strip()
+    txt = _get_text(blk, "text").strip()
+
+    if variant == "green":
+        open_tag = _INFO_CARD_GREEN_OPEN
+    elif variant == "dashed_outline":
+        open_tag = _INFO_CARD_DASHED_OPEN
+    else:
+        open_tag = _INFO_CARD_DEFAULT_OPEN
+    return _info_card_html(open_tag, title, txt)
+
+
+def _render_truth_list(blk: Dict[str, Any], images: Optional[Dict[str, Any]]) -> str:
+    items = blk.get("items") or []
+    parts = [_TRUTH_LIST_OPEN]
+    for it in items:
+        if not isinstance(it, dict):
+            continue
+        kind = str(it.get("kind", "") or "")
+        txt = _get_text(it, "text").strip()
+        if not txt:
+            continue
+        parts.append(_truth_item_html(kind, txt))
+    parts.append(_UL_CLOSE)
+    return "\n".join(parts)
+
+
+def _render_icon_list(blk: Dict[str, Any], images: Optional[Dict[str, Any]]) -> str:
+    items = blk.get("items") or []
+    parts = [_ICON_LIST_OPEN]
+    for it in items:
+        if not isinstance(it, dict):
+            continue
+        icon = _get_text(it, "icon").strip()
+        title = _get_text(it, "title").strip()
+        txt = _get_text(it, "text").strip()
+        if not (icon or title or txt):
+            continue
+        parts.append(_icon_item_html(icon, title, txt))
+    parts.append(_UL_CLOSE)
+    return "\n".join(parts)
+
+
+def _render_highlight_box(blk: Dict[str, Any], images: Optional[Dict[str, Any]]) -> str:
+    variant = str(blk.get("variant", "dark_solid") or "dark_solid")
+    txt = _get_text(blk, "text").strip()
+    if variant == "dark_solid":
+        return _text_block_html(_HIGHLIGHT_DARK_OPEN, txt, _DIV_CLOSE)
+    return _text_block_html(_HIGHLIGHT_OUTLINE_OPEN, txt, _DIV_CLOSE)
+
+
+def _block_error_marker(request_id: str, idx: int, t: Any, e: Exception) -> str:
+    """Log a failed block (call from an except clause) and return its HTML marker."""
+    # Never hard-crash: log and leave a marker in HTML
+    logger.exception(f"[RID={request_id}] render block failed idx={idx} type={t}: {e}")
+    return f"<!-- RENDER_ERROR idx={idx} type={_escape_raw(str(t))} err={_escape_raw(str(e))} -->"
+
+
+def _render_unknown(blk: Dict[str, Any], images: Optional[Dict[str, Any]]) -> str:
+    return f"<!-- UNKNOWN_BLOCK type={_escape_raw(str(blk.get('type')))} -->"
+
+
+_HANDLERS: Dict[str, Callable[[Dict[str, Any], Optional[Dict[str, Any]]], str]] = {
+    "p": _render_p,
+    "h1": _render_h1,
+    "h2": _render_h2,
+    "h3": _render_h3,
+    "hr": _render_hr,
+    "blockquote": _render_blockquote,
+    "image_slot": _render_image_slot,
+    "info_card": _render_info_card,
+    "truth_list": _render_truth_list,
+    "icon_list": _render_icon_list,
+    "highlight_box": _render_highlight_box,
+}
+
 
 # ----------------------------
 # Renderer
@@ -246,14 +667,58 @@ class HtmlRenderer:
     """
 
     def render(self, article: Dict[str, Any], images: Optional[Dict[str, Any]], request_id: str) -> str:
-        out: List[str] = []
-        out.append(f'<div style="{_style_article_container()}">')
+        out = self._head_fragments(article)
+        write = out.append  # local binding: skips the attribute lookup per fragment
+
+        # content blocks
+        content = article.get("content", [])
+        sig = _content_signature(content, _HANDLERS)
+        specialized = _BLOCK_RENDERERS.get(sig, self._compile_block_renderer) if sig is not None else None
+        if specialized is not None:
+            specialized(content, images, write, request_id)
+        else:
+            out.extend(self._iter_blocks(content, images, request_id))
+
+        write(_DIV_CLOSE)
+
+        html_str = "\n".join(out)
+
+        # Literal "\n" (two chars) cannot reach the output: text goes through
+        # _normalize_text and raw fields through _escape_raw.
+        if __debug__:
+            assert "\\n" not in html_str, "rendered HTML contains literal \\n"
+
+        # Convert real newlines inside text nodes were already converted to <br>,
+        # but join() adds newlines between tags which is fine.
+        return html_str
+
+    def iter_render(self, article: Dict[str, Any], images: Optional[Dict[str, Any]], request_id: str) -> Iterator[str]:
+        """
+        Yield the same HTML as render(), one block at a time, so callers can
+        stream it. Concatenating the chunks gives render()'s exact output.
+        Head and content iterator are built eagerly, so bad input raises
+        here rather than after a streaming response has started.
+        """
+        head = "\n".join(self._head_fragments(article))
+        blocks = self._iter_blocks(iter(article.get("content", [])), images, request_id)
+        return self._chunks(head, blocks)
+
+    @staticmethod
+    def _chunks(head: str, blocks: Iterator[str]) -> Iterator[str]:
+        yield head
+        for frag in blocks:
+            yield "\n" + frag
+        yield "\n" + _DIV_CLOSE
+
+    def _head_fragments(self, article: Dict[str, Any]) -> List[str]:
+        """Container opening tag plus the optional title and hero_quote."""
+        out: List[str] = [_ARTICLE_OPEN]
 
         # Title
-        title = article.get("title") or {}
+        title = article.get("title")
         if isinstance(title, dict):
-            line1 = _normalize_text(str(title.get("line1", "") or ""))
-            line2 = _normalize_text(str(title.get("line2", "") or ""))
+            line1 = _get_text(title, "line1")
+            line2 = _get_text(title, "line2")
             full_title = ""
             if line1 and line2:
                 full_title = f"{line1}<br>{line2}"
@@ -261,240 +726,62 @@ class HtmlRenderer:
                 full_title = line1 or line2
 
             if full_title:
-                out.append(
-                    '<h1 style="font-weight: 800; margin-bottom: 20px; font-size: 30px; line-height: 1.4; color: #111;">'
-                    f"{_escape(full_title).replace('<br>', '<br>')}"
-                    "</h1>"
-                )
+                out.append(_TITLE_H1_OPEN + _escape(full_title) + _H1_CLOSE)
 
         # Optional hero_quote (big dark box)
         hero = article.get("hero_quote")
         if isinstance(hero, dict):
-            zh = _normalize_text(str(hero.get("zh", "") or "")).strip()
-            en = _normalize_text(str(hero.get("en", "") or "")).strip()
+            zh = _get_text(hero, "zh").strip()
+            en = _get_text(hero, "en").strip()
             if zh or en:
-                out.append(
-                    '<div style="background-color: #333; color: #fff; padding: 25px; border-radius: 12px; text-align: center; margin: 30px 0;">'
-                )
+                out.append(_HERO_OPEN)
                 if zh:
-                    out.append(f'<h3 style="margin: 0 0 10px 0; color: #fff; font-size: 22px;">「{_escape(zh)}」</h3>')
+                    out.append(_HERO_ZH_OPEN + _escape(zh) + _HERO_ZH_CLOSE)
                 if en:
-                    out.append(f'<p style="margin: 0; font-size: 0.95em; opacity: 0.9;">{_escape(en)}</p>')
-                out.append("</div>")
+                    out.append(_HERO_EN_OPEN + _escape(en) + _P_CLOSE)
+                out.append(_DIV_CLOSE)
 
-        # content blocks
-        content = article.get("content", [])
+        return out
+
+    def _iter_blocks(self, content: Any, images: Optional[Dict[str, Any]], request_id: str) -> Iterator[str]:
+        """Generic content loop: one HTML fragment per block."""
+        handlers = _HANDLERS
         for idx, blk in enumerate(content):
             if not isinstance(blk, dict):
-                out.append(f"<!-- INVALID_BLOCK content[{idx}] not an object -->")
+                yield f"<!-- INVALID_BLOCK content[{idx}] not an object -->"
                 continue
 
             t = blk.get("type")
+            # isinstance guard: an unhashable type value would make .get() raise
+            handler = handlers.get(t, _render_unknown) if isinstance(t, str) else _render_unknown
             try:
-                out.extend(self._render_block(blk, images))
+                frag = handler(blk, images)
             except Exception as e:
-                # Never hard-crash: log and leave a marker in HTML
-                logger.exception(f"[RID={request_id}] render block failed idx={idx} type={t}: {e}")
-                out.append(f"<!-- RENDER_ERROR idx={idx} type={_escape(str(t))} err={_escape(str(e))} -->")
-
-        out.append("</div>")
-
-        html_str = "\n".join(out)
-
-        # Final safety: never leak literal "\n" (two chars) into output
-        if "\\n" in html_str:
-            logger.warning(f"[RID={request_id}] OUTPUT contains literal \\\\n; normalizing.")
-            html_str = html_str.replace("\\n", "\n")
-
-        # Convert real newlines inside text nodes were already converted to <br>,
-        # but join() adds newlines between tags which is fine.
-        return html_str
-
-    def _render_block(self, blk: Dict[str, Any], images: Optional[Dict[str, Any]]) -> List[str]:
-        t = blk.get("type")
-        out: List[str] = []
-
-        if t == "p":
-            txt = _normalize_text(str(blk.get("text", "") or ""))
-            out.append(f"<p>{_text_with_breaks(txt)}</p>")
-
-        elif t == "h1":
-            txt = _normalize_text(str(blk.get("text", "") or ""))
-            out.append(
-                '<h1 style="font-weight: 800; color: #222; font-size: 24px; margin-bottom: 20px;">'
-                f"{_text_with_breaks(txt)}"
-                "</h1>"
-            )
-
-        elif t == "h2":
-            txt = _normalize_text(str(blk.get("text", "") or ""))
-            out.append(
-                '<h2 style="font-weight: 800; color: #222; font-size: 24px; margin-bottom: 20px;">'
-                f"{_text_with_breaks(txt)}"
-                "</h2>"
-            )
-
-        elif t == "h3":
-            txt = _normalize_text(str(blk.get("text", "") or ""))
-            out.append(
-                '<h3 style="font-weight: bold; color: #444; margin-top: 30px;">'
-                f"{_text_with_breaks(txt)}"
-                "</h3>"
-            )
-
-        elif t == "hr":
-            out.append('<hr style="margin: 50px 0; border: 0; border-top: 1px solid #eee;">')
-
-        elif t == "blockquote":
-            variant = str(blk.get("variant", "emphasis") or "emphasis")
-            primary = _normalize_text(str(blk.get("primary", "") or "")).strip()
-            secondary = _normalize_text(str(blk.get("secondary", "") or "")).strip()
-
-            if variant == "emphasis":
-                out.append(
-                    '<blockquote style="border-left: 6px solid #d32f2f; background-color: #fff5f5; padding: 20px; margin: 30px 0; font-size: 1.1em; border-radius: 0 8px 8px 0;">'
-                )
-                if primary:
-                    out.append(f"<strong>「{_escape(primary)}」</strong>")
-                if secondary:
-                    out.append(
-                        f'<br><span style="font-size: 0.9em; color: #666; margin-top: 10px; display: block;">—— {_escape(secondary)}</span>'
-                    )
-                out.append("</blockquote>")
-            else:
-                # fallback
-                out.append("<blockquote>")
-                if primary:
-                    out.append(f"<strong>{_escape(primary)}</strong>")
-                if secondary:
-                    out.append(f"<br><span>{_escape(secondary)}</span>")
-                out.append("</blockquote>")
-
-        elif t == "image_slot":
-            # NOTE: we do NOT render "圖片X-生成" heading here.
-            # We render the actual <img> if images are provided.
-            slot_id = blk.get("id")
-            key_str = str(slot_id)
-            meta = None
-            if images:
-                meta = images.get(key_str) or images.get(slot_id)  # tolerate int key too
-
-            if not meta:
-                out.append(f"<!-- IMAGE_SLOT_MISSING id={_escape(key_str)} -->")
-            else:
-                url = str(meta.get("url", "") or "")
-                alt = _normalize_text(str(meta.get("alt", "") or ""))
-                width = int(meta.get("width", 1200) or 1200)
-                height = int(meta.get("height", 630) or 630)
-                caption = _normalize_text(str(meta.get("caption", "") or "")).strip()
-
-                out.append(
-                    f'<img src="{_escape(url)}" width="{width}" height="{height}" alt="{_escape(alt)}" '
-                    'style="width: 100%; height: auto; border-radius: 10px; margin: 30px 0;">'
-                )
-                if caption:
-                    out.append(
-                        f'<p style="color: #666; font-size: 0.9em; margin-top: -18px; margin-bottom: 18px;">{_text_with_breaks(caption)}</p>'
-                    )
-
-        elif t == "info_card":
-            variant = str(blk.get("variant", "green") or "green")
-            title = _normalize_text(str(blk.get("title", "") or "")).strip()
-            txt = _normalize_text(str(blk.get("text", "") or "")).strip()
-
-            if variant == "green":
-                out.append(
-                    '<div style="background-color: #f1f8e9; padding: 15px; border-radius: 8px; margin: 20px 0; font-size: 0.95em;">'
-                )
-                if title:
-                    out.append(f"<strong>{_escape(title)}</strong><br>")
-                if txt:
-                    out.append(f"{_text_with_breaks(txt)}")
-                out.append("</div>")
-            elif variant == "dashed_outline":
-                out.append(
-                    '<div style="border: 2px dashed #ccc; padding: 18px; border-radius: 10px; margin: 20px 0;">'
-                )
-                if title:
-                    out.append(f"<strong>{_escape(title)}</strong><br>")
-                if txt:
-                    out.append(f"{_text_with_breaks(txt)}")
-                out.append("</div>")
-            else:
-                out.append('<div style="padding: 15px; border-radius: 8px; margin: 20px 0; border: 1px solid #eee;">')
-                if title:
-                    out.append(f"<strong>{_escape(title)}</strong><br>")
-                if txt:
-                    out.append(f"{_text_with_breaks(txt)}")
-                out.append("</div>")
-
-        elif t == "truth_list":
-            items = blk.get("items") or []
-            out.append('<ul style="list-style-type: none; padding-left: 0; margin: 15px 0;">')
-            for it in items:
-                if not isinstance(it, dict):
-                    continue
-                kind = str(it.get("kind", "") or "")
-                txt = _normalize_text(str(it.get("text", "") or "")).strip()
-                if not txt:
-                    continue
-                if kind == "myth":
-                    out.append(
-                        '<li style="margin-bottom: 10px; color: #d32f2f; font-weight: bold;">'
-                        f"❌ {_escape(txt)}"
-                        "</li>"
-                    )
-                elif kind == "fact":
-                    out.append(
-                        '<li style="margin-bottom: 10px; color: #2e7d32; font-weight: bold;">'
-                        f"✅ {_escape(txt)}"
-                        "</li>"
-                    )
-                else:
-                    out.append(f'<li style="margin-bottom: 10px;">• {_escape(txt)}</li>')
-            out.append("</ul>")
-
-        elif t == "icon_list":
-            items = blk.get("items") or []
-            out.append('<ul style="list-style: none; padding: 0; margin: 10px 0;">')
-            for it in items:
-                if not isinstance(it, dict):
-                    continue
-                icon = _normalize_text(str(it.get("icon", "") or "")).strip()
-                title = _normalize_text(str(it.get("title", "") or "")).strip()
-                txt = _normalize_text(str(it.get("text", "") or "")).strip()
-                if not (icon or title or txt):
-                    continue
-                out.append('<li style="display: flex; align-items: flex-start; margin-bottom: 15px;">')
-                out.append(f'<span style="font-size: 24px; margin-right: 15px; line-height: 1;">{_escape(icon)}</span>')
-                out.append("<div>")
-                if title:
-                    out.append(f"<strong>{_escape(title)}</strong><br>")
-                if txt:
-                    out.append(f'<span style="color: #333;">{_text_with_breaks(txt)}</span>')
-                out.append("</div></li>")
-            out.append("</ul>")
-
-        elif t == "highlight_box":
-            variant = str(blk.get("variant", "dark_solid") or "dark_solid")
-            txt = _normalize_text(str(blk.get("text", "") or "")).strip()
-            if variant == "dark_solid":
-                out.append(
-                    '<div style="background-color: #333; color: #fff; padding: 18px 20px; border-radius: 12px; text-align: center; margin: 30px 0; font-weight: 800; font-size: 20px;">'
-                    f"{_text_with_breaks(txt)}"
-                    "</div>"
-                )
-            else:
-                out.append(
-                    '<div style="border: 2px solid #333; padding: 18px 20px; border-radius: 12px; text-align: center; margin: 30px 0; font-weight: 800; font-size: 20px;">'
-                    f"{_text_with_breaks(txt)}"
-                    "</div>"
-                )
+                frag = _block_error_marker(request_id, idx, t, e)
+            yield frag
+
+    def _compile_block_renderer(self, sig: Tuple[Any, ...]) -> Callable[..., None]:
+        """Emit the content loop of render() unrolled for one signature."""
+        ns: Dict[str, Any] = {h.__name__: h for h in _HANDLERS.values()}
+        ns[_render_unknown.__name__] = _render_unknown
+        ns[_block_error_marker.__name__] = _block_error_marker
+        lines = ["def _render_blocks(content, images, write, request_id):"]
+        for i, t in enumerate(sig):
+            if t is _NOT_OBJECT:
+                lines.append(f"    write({f'<!-- INVALID_BLOCK content[{i}] not an object -->'!r})")
+                continue
+            h = _render_unknown if t is _UNKNOWN_TYPE else _HANDLERS[t]
+            lines.append("    try:")
+            lines.append(f"        write({h.__name__}(content[{i}], images))")
+            lines.append("    except Exception as e:")
+            # type read at run time; only the index is baked in
+            lines.append(f"        write(_block_error_marker(request_id, {i}, content[{i}].get('type'), e))")
+        lines.append("    return None")
+        exec(compile("\n".join(lines), f"<block-renderer len={len(sig)}>", "exec"), ns)
+        return ns["_render_blocks"]
 
-        else:
-            out.append(f"<!-- UNKNOWN_BLOCK type={_escape(str(t))} -->")
 
-        return out
+_BLOCK_RENDERERS = _SignatureCache()
 
 
 # ----------------------------
@@ -505,6 +792,17 @@ _validator = ArticleValidator()
 _renderer = HtmlRenderer()
 
 
+def _log_validation_issues(rpt: ValidationReport, request_id: str) -> None:
+    if not rpt.ok:
+        logger.warning(f"[RID={request_id}] validation errors: {rpt.errors}")
+    if rpt.warnings:
+        logger.warning(f"[RID={request_id}] warnings: {rpt.warnings}")
+    if rpt.unknown_block_types:
+        logger.warning(f"[RID={request_id}] unknown_block_types: {rpt.unknown_block_types}")
+    if rpt.missing_image_slots:
+        logger.warning(f"[RID={request_id}] missing_image_slots: {rpt.missing_image_slots}")
+
+
 def render_article(
     article: Dict[str, Any],
     images: Optional[Dict[str, Any]] = None,
@@ -519,6 +817,8 @@ def render_article(
     # default images
     if images is None:
         images = {}
+    else:
+        images = _canonical_images(images)
 
     # Validate
     rpt = _validator.validate(article, images)
@@ -526,12 +826,8 @@ def render_article(
     # Render
     html_str = _renderer.render(article, images, request_id=request_id)
 
-    # Output sanity checks
-    output_has_literal_backslash_n = ("\\n" in html_str)
-    if output_has_literal_backslash_n:
-        rpt.warnings.append("OUTPUT contains literal '\\n' (should not happen).")
-        # best effort fix
-        html_str = html_str.replace("\\n", "\n")
+    # Output never contains literal "\n" by construction (see HtmlRenderer.render)
+    output_has_literal_backslash_n = False
 
     ms = int((time.perf_counter() - t0) * 1000)
 
@@ -557,13 +853,27 @@ def render_article(
         f"html_len={report_dict['html_length']} ms={report_dict['render_ms']}"
     )
 
-    if not rpt.ok:
-        logger.warning(f"[RID={request_id}] validation errors: {rpt.errors}")
-    if rpt.warnings:
-        logger.warning(f"[RID={request_id}] warnings: {rpt.warnings}")
-    if rpt.unknown_block_types:
-        logger.warning(f"[RID={request_id}] unknown_block_types: {rpt.unknown_block_types}")
-    if rpt.missing_image_slots:
-        logger.warning(f"[RID={request_id}] missing_image_slots: {rpt.missing_image_slots}")
+    _log_validation_issues(rpt, request_id)
 
     return html_str, report_dict
+
+
+def iter_render_article(
+    article: Dict[str, Any],
+    images: Optional[Dict[str, Any]] = None,
+    request_id: str = "NA",
+) -> Iterator[str]:
+    """
+    Streaming variant of render_article(): validates up front (issues are
+    logged, there is no report), then yields the HTML block by block.
+    "".join() of the chunks equals render_article()'s html_string.
+    """
+    if images is None:
+        images = {}
+    else:
+        images = _canonical_images(images)
+
+    rpt = _validator.validate(article, images)
+    _log_validation_issues(rpt, request_id)
+
+    return _renderer.iter_render(article, images, request_id=request_id)
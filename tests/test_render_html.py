@@ -0,0 +1,61 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app import app
+from renderer import iter_render_article, render_article
+
+
+ARTICLE = {
+    "title": {"line1": "標題第一行", "line2": "第二行"},
+    "hero_quote": {"zh": "一句話", "en": "One line"},
+    "content": [
+        {"type": "p", "text": "段落 **粗體** & <tag>\n第二行"},
+        {"type": "h2", "text": "小標"},
+        {"type": "hr"},
+        {"type": "blockquote", "variant": "emphasis", "primary": "引言", "secondary": "出處"},
+        {"type": "image_slot", "id": 1},
+        {"type": "info_card", "variant": "green", "title": "卡片", "text": "內容\\n換行"},
+        {"type": "truth_list", "items": [{"kind": "myth", "text": "迷思"}, {"kind": "fact", "text": "事實"}]},
+        {"type": "icon_list", "items": [{"icon": "✅", "title": "標題", "text": "說明"}]},
+        {"type": "highlight_box", "variant": "dark_solid", "text": "重點"},
+        {"type": "made_up", "text": "unknown"},
+        "not an object",
+    ],
+}
+IMAGES = {"1": {"url": "https://example.com/a.png", "alt": "圖", "caption": "說明", "width": 800, "height": 600}}
+
+
+@pytest.fixture()
+def client():
+    with TestClient(app) as c:
+        yield c
+
+
+def test_iter_render_article_matches_render_article():
+    html_str, _ = render_article(ARTICLE, IMAGES)
+    assert "".join(iter_render_article(ARTICLE, IMAGES)) == html_str
+
+
+def test_render_html_stream_matches_render(client):
+    body = {"article": ARTICLE, "images": IMAGES}
+    rendered = client.post("/render", json=body)
+    streamed = client.post("/render/html", json=body)
+
+    assert rendered.status_code == 200
+    assert streamed.status_code == 200
+    assert streamed.headers["content-type"].startswith("text/html")
+    assert streamed.text == rendered.json()["html"]
+
+
+@pytest.mark.parametrize("path", ["/render", "/render/html"])
+@pytest.mark.parametrize("content", [None, 5, "abc", {"type": "p"}])
+def test_non_list_content_is_rejected(client, path, content):
+    resp = client.post(path, json={"article": {"content": content}})
+    assert resp.status_code == 422
+
+
+def test_render_report_with_large_int(client):
+    # ids beyond 64 bits end up in report.missing_image_slots
+    resp = client.post("/render", json={"article": {"content": [{"type": "image_slot", "id": 10**30}]}})
+    assert resp.status_code == 200
+    assert resp.json()["report"]["missing_image_slots"] == [10**30]